@@ -91,6 +91,11 @@ DATABASES = {
     'default': env.db('DATABASE_URL', default=f'sqlite:///{BASE_DIR.parent / "db.sqlite3"}')
 }
 
+# Persistent connections: reuse a connection for up to CONN_MAX_AGE seconds
+# instead of reconnecting on every request; health checks drop dead ones
+DATABASES['default']['CONN_MAX_AGE'] = env.int('CONN_MAX_AGE', default=600)
+DATABASES['default']['CONN_HEALTH_CHECKS'] = True
+
 
 # Password validation
 # https://docs.djangoproject.com/en/6.0/ref/settings/#auth-password-validators
@@ -147,3 +152,14 @@ REST_FRAMEWORK = {
     ],
     'EXCEPTION_HANDLER': 'config.exceptions.custom_exception_handler',
 }
+
+
+# Bulk writes
+# Rows per INSERT statement for bulk_create in services and data loading
+BULK_BATCH_SIZE = env.int('BULK_BATCH_SIZE', default=1000)
+
+
+# Feature flags
+# portfolios.urls has no routes until the APIs are added (Step 9); keep it out
+# of the URL resolver until then
+FEATURE_PORTFOLIO_URLS = env.bool('FEATURE_PORTFOLIO_URLS', default=False)
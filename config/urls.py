@@ -14,15 +14,20 @@ Including another URLconf
     1. Import the include() function: from django.urls import include, path
     2. Add a URL to urlpatterns:  path('blog/', include('blog.urls'))
 """
+from django.conf import settings
 from django.contrib import admin
 from django.urls import include, path
 
-# Domain patterns following styleguide structure
-portfolio_patterns = [
-    path('', include(('portfolios.urls', 'portfolios'))),
-]
-
 urlpatterns = [
     path('admin/', admin.site.urls),
-    path('api/portfolios/', include((portfolio_patterns, 'portfolios'))),
 ]
+
+if settings.FEATURE_PORTFOLIO_URLS:
+    # Domain patterns following styleguide structure
+    portfolio_patterns = [
+        path('', include(('portfolios.urls', 'portfolios'))),
+    ]
+    
+    urlpatterns += [
+        path('api/portfolios/', include((portfolio_patterns, 'portfolios'))),
+    ]
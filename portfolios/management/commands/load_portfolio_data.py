@@ -5,23 +5,32 @@ This command reads datos.xlsx and loads:
 - Portfolios (Portfolio 1 and Portfolio 2)
 - Initial weights for each asset in each portfolio
 - Historical prices for all assets
+
+Everything (including --clear) runs in a single transaction, so a failed
+load leaves the database as it was.
 """
-from datetime import date
+import csv
+import io
+import re
+from datetime import date, datetime
 from decimal import Decimal, InvalidOperation
 from pathlib import Path
 
+from django.conf import settings
 from django.core.management.base import BaseCommand, CommandError
-from django.db import transaction
+from django.db import connection, transaction
+from django.utils import timezone
 from openpyxl import load_workbook
 
 from portfolios.models import Asset, Portfolio, Price, PortfolioWeight
-from portfolios.services import (
-    asset_create,
-    portfolio_create,
-    price_create,
-    portfolio_weight_create,
-    portfolio_initial_quantities_calculate,
-)
+from portfolios.services import portfolio_initial_quantities_calculate
+
+# Quantums matching the decimal_places of Price.price and PortfolioWeight.initial_weight
+PRICE_QUANTUM = Decimal('0.01')
+WEIGHT_QUANTUM = Decimal('0.000001')
+
+# DD/MM/YY or DD/MM/YYYY
+DATE_RE = re.compile(r'^(\d{1,2})/(\d{1,2})/(\d{2,4})$')
 
 
 def parse_date(date_str: str) -> date:
@@ -36,24 +45,60 @@ def parse_date(date_str: str) -> date:
     Raises:
         ValueError: If date format is invalid
     """
+    match = DATE_RE.match(date_str.strip())
+    if match is None:
+        raise ValueError(f"Invalid date format: {date_str}")
+    
+    day, month, year = map(int, match.groups())
+    
+    # Handle 2-digit years: assume 20XX for years 00-99
+    if year < 100:
+        year += 2000
+    
     try:
-        parts = date_str.split('/')
-        if len(parts) != 3:
-            raise ValueError(f"Invalid date format: {date_str}")
-        
-        day = int(parts[0])
-        month = int(parts[1])
-        year = int(parts[2])
-        
-        # Handle 2-digit years: assume 20XX for years 00-99
-        if year < 100:
-            year += 2000
-        
         return date(year, month, day)
-    except (ValueError, IndexError) as e:
+    except ValueError as e:
         raise ValueError(f"Invalid date format: {date_str}") from e
 
 
+def parse_name(value) -> str | None:
+    """Normalize a name cell (asset or header) to a stripped string.
+    
+    Args:
+        value: Cell value, usually already a str
+    
+    Returns:
+        Stripped name, or None for empty cells
+    """
+    if value is None:
+        return None
+    if type(value) is not str:
+        value = str(value)
+    return value.strip()
+
+
+def parse_decimal(value, quantum: Decimal) -> Decimal:
+    """Convert a numeric cell value to Decimal rounded to quantum.
+    
+    Args:
+        value: Cell value (float or int for numeric cells, str otherwise)
+        quantum: Decimal quantum to round to (e.g., Decimal('0.01'))
+    
+    Returns:
+        Decimal value rounded to quantum
+    
+    Raises:
+        InvalidOperation: If value is not a valid number
+    """
+    value_type = type(value)
+    if value_type is int or value_type is Decimal:
+        # Already exact, no string round-trip needed
+        decimal_value = Decimal(value)
+    else:
+        decimal_value = Decimal(str(value))
+    return decimal_value.quantize(quantum)
+
+
 class Command(BaseCommand):
     help = 'Load portfolio data from datos.xlsx Excel file'
 
@@ -70,6 +115,7 @@ class Command(BaseCommand):
             help='Clear existing data before loading'
         )
 
+    @transaction.atomic
     def handle(self, *args, **options):
         file_path = Path(options['file'])
         
@@ -83,15 +129,14 @@ class Command(BaseCommand):
         
         if options['clear']:
             self.stdout.write(self.style.WARNING('Clearing existing data...'))
-            Price.objects.all().delete()
-            PortfolioWeight.objects.all().delete()
-            Portfolio.objects.all().delete()
-            Asset.objects.all().delete()
+            self._clear_data()
             self.stdout.write(self.style.SUCCESS('Existing data cleared.'))
         
+        workbook = None
         try:
             self.stdout.write(f'Loading Excel file: {file_path}')
-            workbook = load_workbook(file_path, data_only=True)
+            # read_only streams each sheet instead of building the full cell tree
+            workbook = load_workbook(file_path, data_only=True, read_only=True)
             
             # Verify required sheets exist
             required_sheets = ['weights', 'Precios']
@@ -102,17 +147,14 @@ class Command(BaseCommand):
             weights_sheet = workbook['weights']
             precios_sheet = workbook['Precios']
             
-            # Load assets
-            assets = self._load_assets(weights_sheet)
-            
             # Load portfolios
             portfolios = self._load_portfolios()
             
-            # Load weights
-            self._load_weights(weights_sheet, assets, portfolios)
+            # Load assets and weights
+            asset_ids = self._load_assets_and_weights(weights_sheet, portfolios)
             
             # Load prices
-            self._load_prices(precios_sheet, assets)
+            self._load_prices(precios_sheet, asset_ids, table_empty=options['clear'])
             
             # Calculate initial quantities
             self._calculate_initial_quantities(portfolios)
@@ -122,51 +164,33 @@ class Command(BaseCommand):
             
         except Exception as e:
             raise CommandError(f'Error loading data: {str(e)}') from e
+        finally:
+            if workbook is not None:
+                workbook.close()
 
-    def _load_assets(self, weights_sheet) -> dict[str, Asset]:
-        """Load assets from Weights sheet.
-        
-        Args:
-            weights_sheet: openpyxl worksheet for Weights
+    def _clear_data(self):
+        """Delete all prices, weights, portfolios and assets.
         
-        Returns:
-            Dictionary mapping asset names to Asset instances
+        On PostgreSQL a single TRUNCATE ... CASCADE is used; it also empties
+        the tables referencing these (holdings, transactions), matching the
+        on_delete=CASCADE behaviour of the ORM deletes used elsewhere.
         """
-        self.stdout.write('\nLoading assets...')
-        assets = {}
-        
-        # Read asset names from Column B (index 2) - rows 2 onwards, skipping header row 1
-        # Structure: Row 1 = ['Fecha', 'activos', 'portafolio 1', 'portafolio 2']
-        #           Row 2+ = [date, asset_name, weight1, weight2]
-        max_row = weights_sheet.max_row
-        for row_num in range(2, max_row + 1):
-            cell = weights_sheet.cell(row=row_num, column=2)  # Column B
-            asset_name = cell.value
-            
-            if asset_name is None or not str(asset_name).strip():
-                continue
-            
-            asset_name = str(asset_name).strip()
-            
-            try:
-                asset = asset_create(name=asset_name)
-                assets[asset_name] = asset
-                self.stdout.write(f'  Created asset: {asset_name}')
-            except Exception as e:
-                self.stdout.write(
-                    self.style.ERROR(f'  Error creating asset {asset_name}: {str(e)}')
-                )
-                raise
+        models = [Price, PortfolioWeight, Portfolio, Asset]
         
-        if len(assets) != 17:
-            self.stdout.write(
-                self.style.WARNING(
-                    f'Warning: Expected 17 assets, found {len(assets)}'
-                )
+        if connection.vendor == 'postgresql':
+            tables = ', '.join(
+                connection.ops.quote_name(model._meta.db_table) for model in models
             )
+            with connection.cursor() as cursor:
+                # TRUNCATE refuses tables with deferred FK checks still pending,
+                # e.g. when called inside a transaction that already wrote rows
+                cursor.execute('SET CONSTRAINTS ALL IMMEDIATE')
+                cursor.execute(f'TRUNCATE {tables} RESTART IDENTITY CASCADE')
+                cursor.execute('SET CONSTRAINTS ALL DEFERRED')
+            return
         
-        self.stdout.write(self.style.SUCCESS(f'Loaded {len(assets)} assets'))
-        return assets
+        for model in models:
+            model.objects.all().delete()
 
     def _load_portfolios(self) -> dict[str, Portfolio]:
         """Load portfolios (Portfolio 1 and Portfolio 2).
@@ -175,87 +199,89 @@ class Command(BaseCommand):
             Dictionary mapping portfolio names to Portfolio instances
         """
         self.stdout.write('\nLoading portfolios...')
-        portfolios = {}
+        portfolio_names = ['Portfolio 1', 'Portfolio 2']
         
         initial_value = Decimal('1000000000.00')
         initial_date = date(2022, 2, 15)
         
-        for portfolio_name in ['Portfolio 1', 'Portfolio 2']:
-            try:
-                portfolio = portfolio_create(
-                    name=portfolio_name,
-                    initial_value=initial_value,
-                    initial_date=initial_date
-                )
-                portfolios[portfolio_name] = portfolio
-                self.stdout.write(f'  Created portfolio: {portfolio_name}')
-            except Exception as e:
-                self.stdout.write(
-                    self.style.ERROR(f'  Error creating portfolio {portfolio_name}: {str(e)}')
-                )
-                raise
+        try:
+            Portfolio.objects.bulk_create(
+                [
+                    Portfolio(
+                        name=portfolio_name,
+                        initial_value=initial_value,
+                        initial_date=initial_date
+                    )
+                    for portfolio_name in portfolio_names
+                ],
+                update_conflicts=True,
+                unique_fields=['name'],
+                update_fields=['initial_value', 'initial_date', 'updated_at']
+            )
+        except Exception as e:
+            self.stdout.write(
+                self.style.ERROR(f'  Error creating portfolios: {str(e)}')
+            )
+            raise
+        
+        # bulk_create does not reliably set pk on conflict, so read them back
+        portfolios = Portfolio.objects.in_bulk(portfolio_names, field_name='name')
+        for portfolio_name in portfolios:
+            self.stdout.write(f'  Created portfolio: {portfolio_name}')
         
         self.stdout.write(self.style.SUCCESS(f'Loaded {len(portfolios)} portfolios'))
         return portfolios
 
-    def _load_weights(
+    def _load_assets_and_weights(
         self,
         weights_sheet,
-        assets: dict[str, Asset],
         portfolios: dict[str, Portfolio]
-    ):
-        """Load weights from Weights sheet.
+    ) -> dict[str, int]:
+        """Load assets and weights from Weights sheet in a single pass.
         
         Args:
             weights_sheet: openpyxl worksheet for Weights
-            assets: Dictionary mapping asset names to Asset instances
             portfolios: Dictionary mapping portfolio names to Portfolio instances
+        
+        Returns:
+            Dictionary mapping asset names to Asset primary keys
         """
-        self.stdout.write('\nLoading weights...')
-        weights_loaded = 0
+        self.stdout.write('\nLoading assets and weights...')
+        asset_names = {}  # Ordered set of asset names found in the sheet
+        weight_rows = []  # (asset_name, portfolio_name, weight) tuples
         
         # Column C = Portfolio 1 weights, Column D = Portfolio 2 weights
         # Weights are already in decimal format (0.28 = 28%), not percentages
         portfolio_columns = {
-            'Portfolio 1': 3,  # Column C
-            'Portfolio 2': 4,  # Column D
+            'Portfolio 1': 2,  # Column C
+            'Portfolio 2': 3,  # Column D
         }
+        # Resolved once instead of per row
+        weight_columns = [
+            (portfolio_name, col_idx)
+            for portfolio_name, col_idx in portfolio_columns.items()
+            if portfolio_name in portfolios
+        ]
         
-        max_row = weights_sheet.max_row
-        for row_num in range(2, max_row + 1):
-            asset_name_cell = weights_sheet.cell(row=row_num, column=2)  # Column B
-            asset_name = asset_name_cell.value
-            
-            if asset_name is None or not str(asset_name).strip():
-                continue
-            
-            asset_name = str(asset_name).strip()
+        # Structure: Row 1 = ['Fecha', 'activos', 'portafolio 1', 'portafolio 2']
+        #           Row 2+ = [date, asset_name, weight1, weight2]
+        for row in weights_sheet.iter_rows(min_row=2, max_col=4, values_only=True):
+            asset_name = row[1]  # Column B
             
-            if asset_name not in assets:
-                self.stdout.write(
-                    self.style.WARNING(f'  Asset {asset_name} not found, skipping')
-                )
+            asset_name = parse_name(asset_name)
+            if not asset_name:
                 continue
+            asset_names[asset_name] = None
             
-            asset = assets[asset_name]
-            
-            for portfolio_name, col_num in portfolio_columns.items():
-                if portfolio_name not in portfolios:
-                    continue
-                
-                portfolio = portfolios[portfolio_name]
-                weight_cell = weights_sheet.cell(row=row_num, column=col_num)
-                weight_value = weight_cell.value
+            for portfolio_name, col_idx in weight_columns:
+                weight_value = row[col_idx]
                 
                 if weight_value is None:
                     continue
                 
                 try:
                     # Weights are already in decimal format (0.28 = 28%)
-                    if isinstance(weight_value, (int, float)):
-                        weight_decimal = Decimal(str(weight_value))
-                    else:
-                        weight_decimal = Decimal(str(weight_value))
+                    weight_decimal = parse_decimal(weight_value, WEIGHT_QUANTUM)
                     
                     # Validate weight range (0 to 1)
                     if weight_decimal < 0 or weight_decimal > 1:
@@ -266,12 +292,7 @@ class Command(BaseCommand):
                         )
                         continue
                     
-                    portfolio_weight_create(
-                        portfolio=portfolio,
-                        asset=asset,
-                        initial_weight=weight_decimal
-                    )
-                    weights_loaded += 1
+                    weight_rows.append((asset_name, portfolio_name, weight_decimal))
                     
                 except (ValueError, InvalidOperation) as e:
                     self.stdout.write(
@@ -280,131 +301,210 @@ class Command(BaseCommand):
                         )
                     )
         
-        self.stdout.write(self.style.SUCCESS(f'Loaded {weights_loaded} weights'))
+        try:
+            Asset.objects.bulk_create(
+                [Asset(name=asset_name) for asset_name in asset_names],
+                batch_size=settings.BULK_BATCH_SIZE,
+                ignore_conflicts=True
+            )
+        except Exception as e:
+            self.stdout.write(
+                self.style.ERROR(f'  Error creating assets: {str(e)}')
+            )
+            raise
+        
+        # ignore_conflicts leaves pk unset, so re-read the rows from the DB
+        asset_ids = dict(
+            Asset.objects.filter(name__in=asset_names).values_list('name', 'pk')
+        )
+        for asset_name in asset_ids:
+            self.stdout.write(f'  Created asset: {asset_name}')
+        
+        if len(asset_ids) != 17:
+            self.stdout.write(
+                self.style.WARNING(
+                    f'Warning: Expected 17 assets, found {len(asset_ids)}'
+                )
+            )
+        
+        self.stdout.write(self.style.SUCCESS(f'Loaded {len(asset_ids)} assets'))
+        
+        # Keyed by (portfolio, asset) so a repeated row overrides the earlier one
+        weights_to_create = {}
+        for asset_name, portfolio_name, weight_decimal in weight_rows:
+            asset_id = asset_ids[asset_name]
+            portfolio_id = portfolios[portfolio_name].pk
+            # Assign FK ids directly; no full_clean(), the DB constraints
+            # (unique_portfolio_asset_weight, weight_range_0_to_1) enforce integrity
+            weights_to_create[(portfolio_id, asset_id)] = PortfolioWeight(
+                portfolio_id=portfolio_id,
+                asset_id=asset_id,
+                initial_weight=weight_decimal
+            )
+        
+        PortfolioWeight.objects.bulk_create(
+            weights_to_create.values(),
+            batch_size=settings.BULK_BATCH_SIZE,
+            update_conflicts=True,
+            unique_fields=['portfolio', 'asset'],
+            update_fields=['initial_weight', 'updated_at']
+        )
+        
+        self.stdout.write(self.style.SUCCESS(f'Loaded {len(weights_to_create)} weights'))
+        return asset_ids
 
-    def _load_prices(self, precios_sheet, assets: dict[str, Asset]):
+    def _load_prices(
+        self,
+        precios_sheet,
+        asset_ids: dict[str, int],
+        table_empty: bool = False
+    ):
         """Load prices from Precios sheet.
         
         Args:
             precios_sheet: openpyxl worksheet for Precios
-            assets: Dictionary mapping asset names to Asset instances
+            asset_ids: Dictionary mapping asset names to Asset primary keys
+            table_empty: True if the Price table was just cleared, which allows
+                COPY on PostgreSQL since no row can conflict
         """
         self.stdout.write('\nLoading prices...')
-        prices_loaded = 0
+        # Keyed by (asset, date) so a repeated date overrides the earlier row
+        prices_to_create = {}
         
         # Row 1 contains asset names as column headers
-        header_row = 1
-        asset_columns = {}  # Map asset name to column number
-        
-        # Find asset columns (starting from column B, which is column 2)
-        max_col = precios_sheet.max_column
-        for col_num in range(2, max_col + 1):
-            cell = precios_sheet.cell(row=header_row, column=col_num)
-            asset_name = cell.value
+        header = next(precios_sheet.iter_rows(max_row=1, values_only=True), ())
+        asset_columns = []  # (column index, asset pk) pairs
+        
+        # Find asset columns (starting from column B, which is index 1)
+        for col_idx in range(1, len(header)):
+            asset_name = header[col_idx]
             
-            if asset_name is None or not str(asset_name).strip():
+            asset_name = parse_name(asset_name)
+            if not asset_name:
                 continue
             
-            asset_name = str(asset_name).strip()
-            
-            if asset_name in assets:
-                asset_columns[col_num] = assets[asset_name]
+            if asset_name in asset_ids:
+                asset_columns.append((col_idx, asset_ids[asset_name]))
             else:
                 self.stdout.write(
                     self.style.WARNING(f'  Asset {asset_name} in header not found in assets, skipping column')
                 )
         
-        # Read price data (starting from row 2, column A contains dates)
-        max_row = precios_sheet.max_row
-        for row_num in range(2, max_row + 1):
+        # Expected date range of the price series
+        min_date = date(2022, 2, 15)
+        max_date = date(2023, 2, 16)
+        
+        # Skipped cells are counted and reported once after the loop
+        invalid_dates = 0
+        out_of_range_dates = 0
+        invalid_prices = 0
+        
+        # Read price data (starting from row 2, column A contains dates).
+        # max_col pads every row to the header width so cells can be indexed directly.
+        rows = precios_sheet.iter_rows(min_row=2, max_col=max(len(header), 1), values_only=True)
+        for row in rows:
             # Get date from column A
-            date_cell = precios_sheet.cell(row=row_num, column=1)
-            date_value = date_cell.value
+            date_value = row[0]
             
             if date_value is None:
                 continue
             
             # Parse date (dates are datetime objects from Excel)
             try:
-                from datetime import datetime
-                # Convert to date object explicitly
-                if isinstance(date_value, date) and not isinstance(date_value, datetime):
-                    price_date = date_value
-                elif isinstance(date_value, datetime):
+                # datetime is checked first since it is also a date subclass
+                if isinstance(date_value, datetime):
                     price_date = date_value.date()
-                elif hasattr(date_value, 'date') and callable(getattr(date_value, 'date', None)):
-                    price_date = date_value.date()
-                elif isinstance(date_value, str):
-                    price_date = parse_date(date_value)
+                elif isinstance(date_value, date):
+                    price_date = date_value
                 else:
-                    # Try to convert to string and parse
                     price_date = parse_date(str(date_value))
-                
-                # Final check: ensure we have a date object (not datetime)
-                if isinstance(price_date, datetime):
-                    price_date = price_date.date()
-                elif not isinstance(price_date, date):
-                    raise ValueError(f"Could not convert to date: {date_value} (type: {type(date_value)})")
-                    
-            except (ValueError, AttributeError, TypeError) as e:
-                self.stdout.write(
-                    self.style.WARNING(f'  Invalid date in row {row_num}: {str(e)}')
-                )
+            except (ValueError, AttributeError, TypeError):
+                invalid_dates += 1
                 continue
             
-            # Validate date range (ensure both are date objects)
-            min_date = date(2022, 2, 15)
-            max_date = date(2023, 2, 16)
-            # Double-check price_date is a date object
-            if not isinstance(price_date, date):
-                self.stdout.write(
-                    self.style.WARNING(f'  Date type error in row {row_num}: {type(price_date)}, skipping')
-                )
-                continue
+            # Validate date range
             if price_date < min_date or price_date > max_date:
-                self.stdout.write(
-                    self.style.WARNING(f'  Date {price_date} out of expected range, skipping')
-                )
+                out_of_range_dates += 1
                 continue
             
             # Read prices for each asset
-            for col_num, asset in asset_columns.items():
-                price_cell = precios_sheet.cell(row=row_num, column=col_num)
-                price_value = price_cell.value
+            for col_idx, asset_id in asset_columns:
+                price_value = row[col_idx]
                 
                 if price_value is None:
                     continue
                 
                 try:
-                    if isinstance(price_value, (int, float)):
-                        price_decimal = Decimal(str(price_value))
-                    else:
-                        price_decimal = Decimal(str(price_value))
+                    price_decimal = parse_decimal(price_value, PRICE_QUANTUM)
                     
                     # Validate price is positive
                     if price_decimal <= 0:
-                        self.stdout.write(
-                            self.style.WARNING(
-                                f'  Invalid price {price_decimal} for {asset.name} on {price_date}, skipping'
-                            )
-                        )
+                        invalid_prices += 1
                         continue
                     
-                    price_create(
-                        asset=asset,
+                    # Assign the FK id directly; no full_clean(), the DB constraints
+                    # (unique_asset_date_price, price_positive) enforce integrity
+                    prices_to_create[(asset_id, price_date)] = Price(
+                        asset_id=asset_id,
                         date=price_date,
                         price=price_decimal
                     )
-                    prices_loaded += 1
                     
-                except (ValueError, InvalidOperation) as e:
-                    self.stdout.write(
-                        self.style.WARNING(
-                            f'  Invalid price value for {asset.name} on {price_date}: {str(e)}'
-                        )
-                    )
+                except (ValueError, InvalidOperation):
+                    invalid_prices += 1
         
-        self.stdout.write(self.style.SUCCESS(f'Loaded {prices_loaded} prices'))
+        if invalid_dates or out_of_range_dates or invalid_prices:
+            self.stdout.write(
+                self.style.WARNING(
+                    f'  Skipped {invalid_dates} invalid dates, '
+                    f'{out_of_range_dates} out-of-range dates and '
+                    f'{invalid_prices} invalid prices'
+                )
+            )
+        
+        if table_empty and connection.vendor == 'postgresql':
+            self._copy_prices(prices_to_create.values())
+        else:
+            Price.objects.bulk_create(
+                prices_to_create.values(),
+                batch_size=settings.BULK_BATCH_SIZE,
+                update_conflicts=True,
+                unique_fields=['asset', 'date'],
+                update_fields=['price', 'updated_at']
+            )
+        
+        self.stdout.write(self.style.SUCCESS(f'Loaded {len(prices_to_create)} prices'))
+
+    def _copy_prices(self, prices):
+        """Insert prices with PostgreSQL COPY FROM STDIN.
+        
+        COPY does not handle conflicts, so this is only used when the
+        Price table is known to be empty.
+        
+        Args:
+            prices: Iterable of unsaved Price instances
+        """
+        now = timezone.now().isoformat()
+        buffer = io.StringIO()
+        writer = csv.writer(buffer)
+        for price in prices:
+            writer.writerow((price.asset_id, price.date.isoformat(), price.price, now, now))
+        buffer.seek(0)
+        
+        sql = (
+            f'COPY {connection.ops.quote_name(Price._meta.db_table)} '
+            '(asset_id, date, price, created_at, updated_at) FROM STDIN WITH CSV'
+        )
+        
+        # Imported lazily: it requires psycopg/psycopg2 to be installed
+        from django.db.backends.postgresql.psycopg_any import is_psycopg3
+        
+        with connection.cursor() as cursor:
+            if is_psycopg3:
+                with cursor.copy(sql) as copy:
+                    copy.write(buffer.getvalue())
+            else:
+                cursor.copy_expert(sql, buffer)
 
     def _calculate_initial_quantities(self, portfolios: dict[str, Portfolio]):
         """Calculate and store initial quantities for all portfolios.
@@ -0,0 +1,21 @@
+# Generated by Django 4.2.30 on 2026-10-15 15:45
+
+from django.db import migrations
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('portfolios', '0001_initial'),
+    ]
+
+    operations = [
+        migrations.RemoveIndex(
+            model_name='portfolioholding',
+            name='portfolios__portfol_a976b2_idx',
+        ),
+        migrations.RemoveIndex(
+            model_name='price',
+            name='portfolios__asset_i_2b7aca_idx',
+        ),
+    ]
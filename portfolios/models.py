@@ -80,9 +80,7 @@ class Price(BaseModel):
     
     class Meta:
         ordering = ['-date']
-        indexes = [
-            models.Index(fields=['asset', 'date']),
-        ]
+        # The unique constraint below already indexes (asset, date)
         constraints = [
             models.UniqueConstraint(
                 fields=['asset', 'date'],
@@ -170,9 +168,7 @@ class PortfolioHolding(BaseModel):
     
     class Meta:
         ordering = ['-date']
-        indexes = [
-            models.Index(fields=['portfolio', 'asset', 'date']),
-        ]
+        # The unique constraint below already indexes (portfolio, asset, date)
         constraints = [
             models.UniqueConstraint(
                 fields=['portfolio', 'asset', 'date'],
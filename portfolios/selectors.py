@@ -18,6 +18,24 @@ from django.core.exceptions import ObjectDoesNotExist
 from .models import Asset, Portfolio, Price, PortfolioWeight
 
 
+def portfolio_get(
+    *,
+    name: str
+) -> Optional[Portfolio]:
+    """Get Portfolio by name.
+    
+    Args:
+        name: Portfolio name
+    
+    Returns:
+        Portfolio instance or None if not found
+    """
+    try:
+        return Portfolio.objects.get(name=name)
+    except ObjectDoesNotExist:
+        return None
+
+
 def portfolio_weight_get(
     *,
     portfolio: Portfolio,
@@ -58,6 +76,23 @@ def price_get(
         return None
 
 
+def price_list(
+    *,
+    date: date,
+    asset_ids: list[int]
+) -> QuerySet[Price]:
+    """Get prices on a date for several assets in one query.
+    
+    Args:
+        date: Price date
+        asset_ids: Primary keys of the assets to fetch prices for
+    
+    Returns:
+        QuerySet of Price instances
+    """
+    return Price.objects.filter(date=date, asset_id__in=asset_ids)
+
+
 def portfolio_weight_list(
     *,
     portfolio: Portfolio
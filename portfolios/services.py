@@ -8,51 +8,85 @@ Service functions should:
 - Use keyword-only arguments (*)
 - Be type-annotated
 - Use @transaction.atomic decorator when needed
-- Call obj.full_clean() before saving
+- Wrap only the write in transaction.atomic() so a database error can be
+  raised as ValidationError without breaking the caller's transaction
+- Call obj.full_clean() before saving (opt-out via validate=False for trusted callers)
 - Follow naming convention: <entity>_<action> (e.g., portfolio_create)
 """
 import logging
-from decimal import Decimal
+from decimal import Context, Decimal, localcontext
 from datetime import date
-from django.db import transaction
+from django.conf import settings
+from django.core.exceptions import ValidationError
+from django.core.validators import DecimalValidator
+from django.db import IntegrityError, transaction
 from .models import Asset, Portfolio, Price, PortfolioWeight, PortfolioHolding
-from .selectors import portfolio_weight_list, price_get
+from .selectors import (
+    portfolio_get,
+    portfolio_weight_get,
+    portfolio_weight_list,
+    price_get,
+    price_list,
+)
 
 logger = logging.getLogger(__name__)
 
+# Arithmetic context and quantum matching PortfolioHolding.quantity
+# (max_digits=20, decimal_places=8)
+QUANTITY_CONTEXT = Context(prec=20)
+QUANTITY_QUANTUM = Decimal('0.00000001')
+
 
-@transaction.atomic
 def asset_create(
     *,
     name: str,
-    symbol: str | None = None
+    symbol: str | None = None,
+    validate: bool = True
 ) -> Asset:
     """Create an Asset instance.
     
     Args:
         name: Asset name (e.g., 'EEUU', 'Europa')
         symbol: Optional symbol/ticker
+        validate: Run field validation before writing; trusted callers
+            with DB-derived input can pass False
     
     Returns:
         Created Asset instance
+    
+    Raises:
+        ValidationError: If the values violate a database constraint
     """
-    asset, created = Asset.objects.get_or_create(
-        name=name,
-        defaults={'symbol': symbol}
-    )
-    if not created and symbol:
-        asset.symbol = symbol
-        asset.full_clean()
-        asset.save()
-    return asset
+    asset = Asset(name=name, symbol=symbol)
+    if validate:
+        asset.full_clean(validate_unique=False, validate_constraints=False)
+    
+    # Upsert in one statement; an existing symbol is only overwritten when given
+    # The savepoint keeps a failed write from breaking the caller's transaction
+    try:
+        with transaction.atomic():
+            if symbol:
+                Asset.objects.bulk_create(
+                    [asset],
+                    update_conflicts=True,
+                    unique_fields=['name'],
+                    update_fields=['symbol', 'updated_at']
+                )
+            else:
+                Asset.objects.bulk_create([asset], ignore_conflicts=True)
+    except IntegrityError as e:
+        raise ValidationError(f"Asset {name} could not be saved") from e
+    
+    # bulk_create does not set pk on conflicting rows, so read the row back
+    return Asset.objects.get(name=name)
 
 
-@transaction.atomic
 def portfolio_create(
     *,
     name: str,
     initial_value: Decimal,
-    initial_date: date
+    initial_date: date,
+    validate: bool = True
 ) -> Portfolio:
     """Create a Portfolio instance.
     
@@ -60,31 +94,62 @@ def portfolio_create(
         name: Portfolio name (e.g., 'Portfolio 1', 'Portfolio 2')
         initial_value: Initial portfolio value V₀ in dollars
         initial_date: Initial date
+        validate: Run field validation before writing; trusted callers
+            with DB-derived input can pass False
     
     Returns:
         Created Portfolio instance
+    
+    Raises:
+        ValidationError: If the values violate a database constraint
     """
-    portfolio, created = Portfolio.objects.get_or_create(
+    portfolio = Portfolio(
         name=name,
-        defaults={
-            'initial_value': initial_value,
-            'initial_date': initial_date
-        }
+        initial_value=initial_value,
+        initial_date=initial_date
     )
-    if not created:
-        portfolio.initial_value = initial_value
-        portfolio.initial_date = initial_date
-        portfolio.full_clean()
-        portfolio.save()
-    return portfolio
+    if validate:
+        portfolio.full_clean(validate_unique=False, validate_constraints=False)
+    
+    # Skip the write when the stored row already matches
+    existing = portfolio_get(name=name)
+    if (
+        existing is not None
+        and existing.initial_value == initial_value
+        and existing.initial_date == initial_date
+    ):
+        return existing
+    
+    # The savepoint keeps a failed write from breaking the caller's transaction
+    try:
+        with transaction.atomic():
+            # The row was just read, so a changed one needs only an UPDATE
+            if existing is not None:
+                existing.initial_value = initial_value
+                existing.initial_date = initial_date
+                existing.save(update_fields=['initial_value', 'initial_date', 'updated_at'])
+                return existing
+            
+            # INSERT ... ON CONFLICT DO UPDATE also covers a concurrent insert
+            Portfolio.objects.bulk_create(
+                [portfolio],
+                update_conflicts=True,
+                unique_fields=['name'],
+                update_fields=['initial_value', 'initial_date', 'updated_at']
+            )
+    except IntegrityError as e:
+        raise ValidationError(f"Portfolio {name} could not be saved") from e
+    
+    # bulk_create does not set pk on conflicting rows, so read the row back
+    return Portfolio.objects.get(name=name)
 
 
-@transaction.atomic
 def price_create(
     *,
     asset: Asset,
     date: date,
-    price: Decimal
+    price: Decimal,
+    validate: bool = True
 ) -> Price:
     """Create a Price instance.
     
@@ -92,28 +157,53 @@ def price_create(
         asset: Related Asset instance
         date: Price date
         price: Asset price p_{i,t}
+        validate: Run field validation before writing; trusted callers
+            with DB-derived input can pass False
     
     Returns:
         Created or existing Price instance
+    
+    Raises:
+        ValidationError: If the values violate a database constraint
     """
-    price_obj, created = Price.objects.get_or_create(
-        asset=asset,
-        date=date,
-        defaults={'price': price}
-    )
-    if not created:
-        price_obj.price = price
-        price_obj.full_clean()
-        price_obj.save()
-    return price_obj
+    price_obj = Price(asset=asset, date=date, price=price)
+    if validate:
+        price_obj.full_clean(validate_unique=False, validate_constraints=False)
+    
+    # Skip the write when the stored row already matches
+    existing = price_get(asset=asset, date=date)
+    if existing is not None and existing.price == price:
+        return existing
+    
+    # The savepoint keeps a failed write from breaking the caller's transaction
+    try:
+        with transaction.atomic():
+            # The row was just read, so a changed one needs only an UPDATE
+            if existing is not None:
+                existing.price = price
+                existing.save(update_fields=['price', 'updated_at'])
+                return existing
+            
+            # INSERT ... ON CONFLICT DO UPDATE also covers a concurrent insert
+            Price.objects.bulk_create(
+                [price_obj],
+                update_conflicts=True,
+                unique_fields=['asset', 'date'],
+                update_fields=['price', 'updated_at']
+            )
+    except IntegrityError as e:
+        raise ValidationError(f"Price for asset {asset.name} on {date} could not be saved") from e
+    
+    # bulk_create does not set pk on conflicting rows, so read the row back
+    return Price.objects.get(asset=asset, date=date)
 
 
-@transaction.atomic
 def portfolio_weight_create(
     *,
     portfolio: Portfolio,
     asset: Asset,
-    initial_weight: Decimal
+    initial_weight: Decimal,
+    validate: bool = True
 ) -> PortfolioWeight:
     """Create a PortfolioWeight instance.
     
@@ -121,29 +211,58 @@ def portfolio_weight_create(
         portfolio: Related Portfolio instance
         asset: Related Asset instance
         initial_weight: Initial weight w_{i,0} as decimal (e.g., 0.15 for 15%)
+        validate: Run field validation before writing; trusted callers
+            with DB-derived input can pass False
     
     Returns:
         Created or existing PortfolioWeight instance
+    
+    Raises:
+        ValidationError: If the values violate a database constraint
     """
-    weight, created = PortfolioWeight.objects.get_or_create(
+    weight = PortfolioWeight(
         portfolio=portfolio,
         asset=asset,
-        defaults={'initial_weight': initial_weight}
+        initial_weight=initial_weight
     )
-    if not created:
-        weight.initial_weight = initial_weight
-        weight.full_clean()
-        weight.save()
-    return weight
+    if validate:
+        weight.full_clean(validate_unique=False, validate_constraints=False)
+    
+    # Skip the write when the stored row already matches
+    existing = portfolio_weight_get(portfolio=portfolio, asset=asset)
+    if existing is not None and existing.initial_weight == initial_weight:
+        return existing
+    
+    # The savepoint keeps a failed write from breaking the caller's transaction
+    try:
+        with transaction.atomic():
+            # The row was just read, so a changed one needs only an UPDATE
+            if existing is not None:
+                existing.initial_weight = initial_weight
+                existing.save(update_fields=['initial_weight', 'updated_at'])
+                return existing
+            
+            # INSERT ... ON CONFLICT DO UPDATE also covers a concurrent insert
+            PortfolioWeight.objects.bulk_create(
+                [weight],
+                update_conflicts=True,
+                unique_fields=['portfolio', 'asset'],
+                update_fields=['initial_weight', 'updated_at']
+            )
+    except IntegrityError as e:
+        raise ValidationError(f"Weight for asset {asset.name} in portfolio {portfolio.name} could not be saved") from e
+    
+    # bulk_create does not set pk on conflicting rows, so read the row back
+    return PortfolioWeight.objects.get(portfolio=portfolio, asset=asset)
 
 
-@transaction.atomic
 def portfolio_holding_create(
     *,
     portfolio: Portfolio,
     asset: Asset,
     date: date,
-    quantity: Decimal
+    quantity: Decimal,
+    validate: bool = True
 ) -> PortfolioHolding:
     """Create a PortfolioHolding instance.
     
@@ -152,21 +271,113 @@ def portfolio_holding_create(
         asset: Related Asset instance
         date: Holding date
         quantity: Quantity c_{i,t}
+        validate: Run field validation before writing; trusted callers
+            with DB-derived input can pass False
     
     Returns:
         Created or existing PortfolioHolding instance
+    
+    Raises:
+        ValidationError: If the values violate a database constraint
     """
-    holding, created = PortfolioHolding.objects.get_or_create(
+    holding = PortfolioHolding(
         portfolio=portfolio,
         asset=asset,
         date=date,
-        defaults={'quantity': quantity}
+        quantity=quantity
+    )
+    if validate:
+        holding.full_clean(validate_unique=False, validate_constraints=False)
+    
+    # Single INSERT ... ON CONFLICT DO UPDATE instead of get_or_create + save
+    # The savepoint keeps a failed write from breaking the caller's transaction
+    try:
+        with transaction.atomic():
+            PortfolioHolding.objects.bulk_create(
+                [holding],
+                update_conflicts=True,
+                unique_fields=['portfolio', 'asset', 'date'],
+                update_fields=['quantity', 'updated_at']
+            )
+    except IntegrityError as e:
+        raise ValidationError(f"Holding for asset {asset.name} in portfolio {portfolio.name} on {date} could not be saved") from e
+    
+    # bulk_create does not set pk on conflicting rows, so read the row back
+    return PortfolioHolding.objects.get(portfolio=portfolio, asset=asset, date=date)
+
+
+def portfolio_holdings_bulk_create(
+    *,
+    rows: list[dict]
+) -> list[PortfolioHolding]:
+    """Create or update many PortfolioHolding rows at once.
+    
+    Rows are checked in Python instead of calling full_clean() per row, then
+    written with INSERT ... ON CONFLICT DO UPDATE in batches of
+    settings.BULK_BATCH_SIZE.
+    
+    Args:
+        rows: Dictionaries with 'portfolio', 'asset', 'date' and 'quantity' keys
+    
+    Returns:
+        List of the PortfolioHolding instances written (pk is not populated)
+    
+    Raises:
+        ValidationError: If a row is missing a key, has a quantity that is not
+            a finite non-negative Decimal fitting the quantity column, or
+            repeats the (portfolio, asset, date) of an earlier row
+    """
+    required_keys = {'portfolio', 'asset', 'date', 'quantity'}
+    quantity_field = PortfolioHolding._meta.get_field('quantity')
+    quantity_validator = DecimalValidator(
+        quantity_field.max_digits,
+        quantity_field.decimal_places
+    )
+    seen_keys = set()
+    holdings = []
+    
+    for row in rows:
+        missing_keys = required_keys - row.keys()
+        if missing_keys:
+            raise ValidationError(f"Holding row missing keys: {', '.join(sorted(missing_keys))}")
+        
+        quantity = row['quantity']
+        # Checked before comparing: NaN, floats and strings would raise other errors
+        if not isinstance(quantity, Decimal) or not quantity.is_finite() or quantity < 0:
+            raise ValidationError(f"Invalid quantity {quantity!r} for asset {row['asset']}")
+        try:
+            quantity_validator(quantity)
+        except ValidationError as e:
+            raise ValidationError(
+                f"Invalid quantity {quantity} for asset {row['asset']}: "
+                f"{' '.join(e.messages)}"
+            ) from e
+        
+        # A repeated key would hit the same row twice in one ON CONFLICT statement
+        key = (row['portfolio'].pk, row['asset'].pk, row['date'])
+        if key in seen_keys:
+            raise ValidationError(
+                f"Duplicate holding row for portfolio {row['portfolio']}, "
+                f"asset {row['asset']} on {row['date']}"
+            )
+        seen_keys.add(key)
+        
+        holdings.append(
+            PortfolioHolding(
+                portfolio=row['portfolio'],
+                asset=row['asset'],
+                date=row['date'],
+                quantity=quantity
+            )
+        )
+    
+    return PortfolioHolding.objects.bulk_create(
+        holdings,
+        batch_size=settings.BULK_BATCH_SIZE,
+        update_conflicts=True,
+        unique_fields=['portfolio', 'asset', 'date'],
+        update_fields=['quantity', 'updated_at']
     )
-    if not created:
-        holding.quantity = quantity
-        holding.full_clean()
-        holding.save()
-    return holding
 
 
 @transaction.atomic
@@ -191,73 +402,106 @@ def portfolio_initial_quantities_calculate(
         Dictionary mapping asset names to PortfolioHolding instances
     
     Raises:
-        ValueError: If portfolio missing required data (initial_value, initial_date)
+        ValidationError: If portfolio missing required data (initial_value, initial_date)
     """
     # Validate portfolio has required data
     if not portfolio.initial_value:
-        raise ValueError(f"Portfolio {portfolio.name} missing initial_value")
+        raise ValidationError(f"Portfolio {portfolio.name} missing initial_value")
     if not portfolio.initial_date:
-        raise ValueError(f"Portfolio {portfolio.name} missing initial_date")
+        raise ValidationError(f"Portfolio {portfolio.name} missing initial_date")
     
     V_0 = portfolio.initial_value
     initial_date = portfolio.initial_date
     holdings = {}
+    holding_rows = []
     
     # Get all weights for the portfolio
-    weights = portfolio_weight_list(portfolio=portfolio)
+    # portfolio_weight_list already joins the asset; only load the columns used here
+    weights = list(
+        portfolio_weight_list(portfolio=portfolio).only(
+            'asset', 'initial_weight', 'asset__name'
+        )
+    )
     
-    if not weights.exists():
-        logger.warning(f"No weights found for portfolio {portfolio.name}")
+    if not weights:
+        logger.warning("No weights found for portfolio %s", portfolio.name)
         return holdings
     
+    # Fetch every initial price in one query instead of one price_get per asset
+    prices = {
+        price.asset_id: price.price
+        for price in price_list(
+            date=initial_date,
+            asset_ids=[weight.asset_id for weight in weights]
+        ).only('asset_id', 'price')
+    }
+    
     # Calculate quantity for each asset
     for weight in weights:
         asset = weight.asset
         w_i_0 = weight.initial_weight
         
         # Get initial price for asset on initial_date
-        price_obj = price_get(asset=asset, date=initial_date)
+        P_i_0 = prices.get(weight.asset_id)
         
-        if price_obj is None:
+        if P_i_0 is None:
             logger.warning(
-                f"Price not found for asset {asset.name} on {initial_date}, skipping"
+                "Price not found for asset %s on %s, skipping",
+                asset.name,
+                initial_date
             )
             continue
         
-        P_i_0 = price_obj.price
-        
         # Validate price is positive (avoid division by zero)
         if P_i_0 <= 0:
             logger.warning(
-                f"Invalid price {P_i_0} for asset {asset.name} on {initial_date}, skipping"
+                "Invalid price %s for asset %s on %s, skipping",
+                P_i_0,
+                asset.name,
+                initial_date
             )
             continue
         
         # Calculate quantity: C_{i,0} = (w_{i,0} * V₀) / P_{i,0}
         try:
-            C_i_0 = (w_i_0 * V_0) / P_i_0
+            with localcontext(QUANTITY_CONTEXT):
+                C_i_0 = ((w_i_0 * V_0) / P_i_0).quantize(QUANTITY_QUANTUM)
             
             # Validate quantity is positive
             if C_i_0 <= 0:
                 logger.warning(
-                    f"Calculated quantity {C_i_0} for asset {asset.name} is not positive, skipping"
+                    "Calculated quantity %s for asset %s is not positive, skipping",
+                    C_i_0,
+                    asset.name
                 )
                 continue
             
-            # Create PortfolioHolding
-            holding = portfolio_holding_create(
-                portfolio=portfolio,
-                asset=asset,
-                date=initial_date,
-                quantity=C_i_0
-            )
-            holdings[asset.name] = holding
+            holding_rows.append({
+                'portfolio': portfolio,
+                'asset': asset,
+                'date': initial_date,
+                'quantity': C_i_0,
+            })
             
         except Exception as e:
             logger.error(
-                f"Error calculating quantity for asset {asset.name}: {str(e)}"
+                "Error calculating quantity for asset %s: %s",
+                asset.name,
+                e
             )
             continue
     
+    # Single INSERT ... ON CONFLICT DO UPDATE instead of one write per asset
+    portfolio_holdings_bulk_create(rows=holding_rows)
+    
+    # bulk_create does not set pk on upserted rows, so read them back
+    saved_holdings = PortfolioHolding.objects.filter(
+        portfolio=portfolio,
+        date=initial_date,
+        asset__in=[row['asset'] for row in holding_rows]
+    ).select_related('asset')
+    for holding in saved_holdings:
+        holdings[holding.asset.name] = holding
+    
     return holdings
 
@@ -0,0 +1,51 @@
+from io import StringIO
+from unittest import skipUnless
+
+from django.core.management import call_command
+from django.db import connection
+from django.test import TestCase
+from django.test.utils import CaptureQueriesContext
+
+from portfolios.models import Asset, PortfolioHolding, PortfolioWeight, Price
+
+
+class LoadPortfolioDataTests(TestCase):
+    def _load(self, *args):
+        call_command('load_portfolio_data', *args, stdout=StringIO())
+    
+    def _snapshot(self):
+        return (
+            set(Price.objects.values_list('asset__name', 'date', 'price')),
+            set(PortfolioWeight.objects.values_list('portfolio__name', 'asset__name', 'initial_weight')),
+            set(PortfolioHolding.objects.values_list('portfolio__name', 'asset__name', 'date', 'quantity')),
+        )
+    
+    def test_command_reload_matches_first_load(self):
+        self._load()
+        first_load = self._snapshot()
+        
+        self._load()
+        self.assertEqual(self._snapshot(), first_load)
+        
+        # On PostgreSQL this runs TRUNCATE and loads prices with COPY
+        self._load('--clear')
+        self.assertEqual(self._snapshot(), first_load)
+    
+    @skipUnless(connection.vendor == 'postgresql', 'TRUNCATE and COPY are PostgreSQL only')
+    def test_command_clear_truncates_and_copies_on_postgresql(self):
+        self._load()
+        prices = set(Price.objects.values_list('asset__name', 'date', 'price'))
+        
+        with CaptureQueriesContext(connection) as queries:
+            self._load('--clear')
+        
+        statements = [query['sql'].split(None, 1)[0] for query in queries]
+        self.assertIn('TRUNCATE', statements)
+        self.assertIn('COPY', statements)
+        
+        # RESTART IDENTITY starts the ids again from 1
+        self.assertEqual(min(Asset.objects.values_list('pk', flat=True)), 1)
+        self.assertEqual(
+            set(Price.objects.values_list('asset__name', 'date', 'price')),
+            prices
+        )
@@ -0,0 +1,39 @@
+from django.core.exceptions import ValidationError
+from django.test import TestCase
+
+from portfolios.models import Asset
+from portfolios.services import asset_create
+
+
+class AssetCreateTests(TestCase):
+    def test_service_creates_asset(self):
+        # SAVEPOINT, INSERT, RELEASE and the read-back
+        with self.assertNumQueries(4):
+            asset = asset_create(name='EEUU', symbol='US')
+        
+        self.assertIsNotNone(asset.pk)
+        self.assertEqual(asset, Asset.objects.get(name='EEUU'))
+        self.assertEqual(asset.symbol, 'US')
+    
+    def test_service_updates_symbol_of_existing_asset(self):
+        existing = Asset.objects.create(name='EEUU', symbol='US')
+        
+        asset = asset_create(name='EEUU', symbol='USA')
+        
+        self.assertEqual(asset.pk, existing.pk)
+        self.assertEqual(Asset.objects.get().symbol, 'USA')
+    
+    def test_service_keeps_symbol_when_none_given(self):
+        existing = Asset.objects.create(name='EEUU', symbol='US')
+        
+        asset = asset_create(name='EEUU')
+        
+        self.assertEqual(asset.pk, existing.pk)
+        self.assertEqual(asset.symbol, 'US')
+        self.assertEqual(Asset.objects.count(), 1)
+    
+    def test_service_raises_error_for_invalid_name(self):
+        with self.assertRaises(ValidationError):
+            asset_create(name='x' * 101)
+        
+        self.assertEqual(Asset.objects.count(), 0)
@@ -0,0 +1,70 @@
+from datetime import date
+from decimal import Decimal
+
+from django.core.exceptions import ValidationError
+from django.test import TestCase
+
+from portfolios.models import Portfolio
+from portfolios.services import portfolio_create
+
+
+class PortfolioCreateTests(TestCase):
+    def test_service_creates_portfolio(self):
+        # Lookup, SAVEPOINT, INSERT, RELEASE and the read-back
+        with self.assertNumQueries(5):
+            portfolio = portfolio_create(
+                name='Portfolio 1',
+                initial_value=Decimal('1000000000'),
+                initial_date=date(2022, 2, 15)
+            )
+        
+        self.assertIsNotNone(portfolio.pk)
+        self.assertEqual(portfolio, Portfolio.objects.get(name='Portfolio 1'))
+    
+    def test_service_skips_write_for_unchanged_portfolio(self):
+        existing = Portfolio.objects.create(
+            name='Portfolio 1',
+            initial_value=Decimal('1000000000'),
+            initial_date=date(2022, 2, 15)
+        )
+        
+        with self.assertNumQueries(1):
+            portfolio = portfolio_create(
+                name='Portfolio 1',
+                initial_value=Decimal('1000000000'),
+                initial_date=date(2022, 2, 15)
+            )
+        
+        self.assertEqual(portfolio.pk, existing.pk)
+        self.assertEqual(portfolio.updated_at, existing.updated_at)
+    
+    def test_service_updates_changed_portfolio(self):
+        existing = Portfolio.objects.create(
+            name='Portfolio 1',
+            initial_value=Decimal('1000000000'),
+            initial_date=date(2022, 2, 15)
+        )
+        
+        # Lookup, SAVEPOINT, UPDATE and RELEASE
+        with self.assertNumQueries(4):
+            portfolio = portfolio_create(
+                name='Portfolio 1',
+                initial_value=Decimal('2000000000'),
+                initial_date=date(2022, 3, 1)
+            )
+        
+        self.assertEqual(portfolio.pk, existing.pk)
+        
+        stored = Portfolio.objects.get()
+        self.assertEqual(stored.initial_value, Decimal('2000000000'))
+        self.assertEqual(stored.initial_date, date(2022, 3, 1))
+    
+    def test_service_raises_error_for_invalid_value(self):
+        with self.assertRaises(ValidationError):
+            portfolio_create(
+                name='Portfolio 1',
+                initial_value=Decimal('1.001'),
+                initial_date=date(2022, 2, 15)
+            )
+        
+        self.assertEqual(Portfolio.objects.count(), 0)
@@ -0,0 +1,68 @@
+from datetime import date
+from decimal import Decimal
+
+from django.core.exceptions import ValidationError
+from django.test import TestCase
+
+from portfolios.models import Asset, Portfolio, PortfolioHolding
+from portfolios.services import portfolio_holding_create
+
+
+class PortfolioHoldingCreateTests(TestCase):
+    def setUp(self):
+        self.portfolio = Portfolio.objects.create(name='Portfolio 1')
+        self.asset = Asset.objects.create(name='EEUU')
+        self.date = date(2022, 2, 15)
+    
+    def test_service_creates_holding(self):
+        # SAVEPOINT, INSERT, RELEASE and the read-back
+        with self.assertNumQueries(4):
+            holding = portfolio_holding_create(
+                portfolio=self.portfolio,
+                asset=self.asset,
+                date=self.date,
+                quantity=Decimal('1215066.22114216'),
+                validate=False
+            )
+        
+        self.assertIsNotNone(holding.pk)
+        self.assertEqual(holding, PortfolioHolding.objects.get())
+        self.assertEqual(holding.quantity, Decimal('1215066.22114216'))
+    
+    def test_service_updates_existing_holding(self):
+        existing = PortfolioHolding.objects.create(
+            portfolio=self.portfolio,
+            asset=self.asset,
+            date=self.date,
+            quantity=Decimal('1')
+        )
+        
+        holding = portfolio_holding_create(
+            portfolio=self.portfolio,
+            asset=self.asset,
+            date=self.date,
+            quantity=Decimal('2')
+        )
+        
+        self.assertEqual(holding.pk, existing.pk)
+        self.assertEqual(PortfolioHolding.objects.get().quantity, Decimal('2'))
+    
+    def test_service_raises_error_for_invalid_quantity(self):
+        with self.assertRaises(ValidationError):
+            portfolio_holding_create(
+                portfolio=self.portfolio,
+                asset=self.asset,
+                date=self.date,
+                quantity=Decimal('1.123456789')
+            )
+        
+        # quantity_non_negative is enforced by the database only
+        with self.assertRaisesMessage(ValidationError, 'could not be saved'):
+            portfolio_holding_create(
+                portfolio=self.portfolio,
+                asset=self.asset,
+                date=self.date,
+                quantity=Decimal('-1')
+            )
+        
+        self.assertEqual(PortfolioHolding.objects.count(), 0)
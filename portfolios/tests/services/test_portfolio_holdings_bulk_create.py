@@ -0,0 +1,111 @@
+from datetime import date
+from decimal import Decimal
+
+from django.core.exceptions import ValidationError
+from django.test import TestCase, override_settings
+
+from portfolios.models import Asset, Portfolio, PortfolioHolding
+from portfolios.services import portfolio_holdings_bulk_create
+
+
+class PortfolioHoldingsBulkCreateTests(TestCase):
+    def setUp(self):
+        self.portfolio = Portfolio.objects.create(
+            name='Portfolio 1',
+            initial_value=Decimal('1000000000'),
+            initial_date=date(2022, 2, 15)
+        )
+        self.assets = [
+            Asset.objects.create(name=f'Asset {i}')
+            for i in range(3)
+        ]
+        self.date = date(2022, 2, 15)
+    
+    def _row(self, asset, quantity):
+        return {
+            'portfolio': self.portfolio,
+            'asset': asset,
+            'date': self.date,
+            'quantity': quantity,
+        }
+    
+    def test_service_creates_holdings(self):
+        portfolio_holdings_bulk_create(
+            rows=[self._row(asset, Decimal('10.5')) for asset in self.assets]
+        )
+        
+        self.assertEqual(PortfolioHolding.objects.count(), 3)
+        self.assertEqual(
+            set(PortfolioHolding.objects.values_list('quantity', flat=True)),
+            {Decimal('10.5')}
+        )
+    
+    def test_service_updates_existing_holdings(self):
+        asset = self.assets[0]
+        PortfolioHolding.objects.create(
+            portfolio=self.portfolio,
+            asset=asset,
+            date=self.date,
+            quantity=Decimal('1')
+        )
+        
+        portfolio_holdings_bulk_create(rows=[self._row(asset, Decimal('2.12345678'))])
+        
+        holding = PortfolioHolding.objects.get()
+        self.assertEqual(holding.asset, asset)
+        self.assertEqual(holding.quantity, Decimal('2.12345678'))
+    
+    @override_settings(BULK_BATCH_SIZE=2)
+    def test_service_writes_in_batches(self):
+        rows = [self._row(asset, Decimal('1')) for asset in self.assets]
+        
+        # Three rows with a batch size of two take two INSERT statements
+        with self.assertNumQueries(2):
+            portfolio_holdings_bulk_create(rows=rows)
+        
+        self.assertEqual(PortfolioHolding.objects.count(), 3)
+    
+    def test_service_raises_error_for_missing_keys(self):
+        row = self._row(self.assets[0], Decimal('1'))
+        del row['date']
+        
+        with self.assertRaisesMessage(ValidationError, 'missing keys: date'):
+            portfolio_holdings_bulk_create(rows=[row])
+    
+    def test_service_raises_error_for_negative_quantity(self):
+        with self.assertRaises(ValidationError):
+            portfolio_holdings_bulk_create(rows=[self._row(self.assets[0], Decimal('-1'))])
+        
+        self.assertEqual(PortfolioHolding.objects.count(), 0)
+    
+    def test_service_raises_error_for_non_decimal_quantity(self):
+        for quantity in [None, Decimal('NaN'), Decimal('Infinity'), 1.5, '1.5']:
+            with self.subTest(quantity=quantity):
+                with self.assertRaisesMessage(ValidationError, 'Invalid quantity'):
+                    portfolio_holdings_bulk_create(rows=[self._row(self.assets[0], quantity)])
+        
+        self.assertEqual(PortfolioHolding.objects.count(), 0)
+    
+    def test_service_raises_error_for_quantity_too_long(self):
+        rows = [
+            self._row(self.assets[0], Decimal('1.123456789')),
+            self._row(self.assets[1], Decimal('1' * 13)),
+        ]
+        
+        for row in rows:
+            with self.subTest(quantity=row['quantity']):
+                with self.assertRaises(ValidationError):
+                    portfolio_holdings_bulk_create(rows=[row])
+        
+        self.assertEqual(PortfolioHolding.objects.count(), 0)
+    
+    def test_service_raises_error_for_duplicate_rows(self):
+        rows = [
+            self._row(self.assets[0], Decimal('1')),
+            self._row(self.assets[0], Decimal('2')),
+        ]
+        
+        with self.assertRaisesMessage(ValidationError, 'Duplicate holding row'):
+            portfolio_holdings_bulk_create(rows=rows)
+        
+        self.assertEqual(PortfolioHolding.objects.count(), 0)
@@ -0,0 +1,105 @@
+from datetime import date
+from decimal import Decimal
+
+from django.core.exceptions import ValidationError
+from django.test import TestCase
+
+from portfolios.models import Asset, Portfolio, PortfolioHolding, PortfolioWeight, Price
+from portfolios.services import portfolio_initial_quantities_calculate
+
+
+class PortfolioInitialQuantitiesCalculateTests(TestCase):
+    def setUp(self):
+        self.date = date(2022, 2, 15)
+        self.portfolio = Portfolio.objects.create(
+            name='Portfolio 1',
+            initial_value=Decimal('1000000000'),
+            initial_date=self.date
+        )
+        self.eeuu = Asset.objects.create(name='EEUU')
+        self.europa = Asset.objects.create(name='Europa')
+    
+    def _weight(self, asset, initial_weight, portfolio=None):
+        PortfolioWeight.objects.create(
+            portfolio=portfolio or self.portfolio,
+            asset=asset,
+            initial_weight=initial_weight
+        )
+    
+    def _price(self, asset, price):
+        Price.objects.create(asset=asset, date=self.date, price=price)
+    
+    def test_service_calculates_quantities(self):
+        self._weight(self.eeuu, Decimal('0.15'))
+        self._weight(self.europa, Decimal('0.85'))
+        self._price(self.eeuu, Decimal('123.45'))
+        self._price(self.europa, Decimal('17'))
+        
+        # Weights, prices, SAVEPOINT, INSERT, RELEASE and the read-back
+        with self.assertNumQueries(6):
+            holdings = portfolio_initial_quantities_calculate(portfolio=self.portfolio)
+        
+        self.assertEqual(set(holdings), {'EEUU', 'Europa'})
+        self.assertEqual(holdings['EEUU'].quantity, Decimal('1215066.82867558'))
+        self.assertEqual(holdings['Europa'].quantity, Decimal('50000000'))
+        self.assertEqual(PortfolioHolding.objects.filter(date=self.date).count(), 2)
+    
+    def test_service_rounds_quantities_half_to_even(self):
+        self.portfolio.initial_value = Decimal('1')
+        self._weight(self.eeuu, Decimal('0.000025'))
+        self._weight(self.europa, Decimal('0.000075'))
+        self._price(self.eeuu, Decimal('1000'))
+        self._price(self.europa, Decimal('1000'))
+        
+        holdings = portfolio_initial_quantities_calculate(portfolio=self.portfolio)
+        
+        # 0.000000025 and 0.000000075 both round to the even last digit
+        self.assertEqual(holdings['EEUU'].quantity, Decimal('0.00000002'))
+        self.assertEqual(holdings['Europa'].quantity, Decimal('0.00000008'))
+    
+    def test_service_updates_existing_holdings(self):
+        self._weight(self.eeuu, Decimal('0.5'))
+        self._price(self.eeuu, Decimal('100'))
+        portfolio_initial_quantities_calculate(portfolio=self.portfolio)
+        
+        Price.objects.filter(asset=self.eeuu).update(price=Decimal('200'))
+        holdings = portfolio_initial_quantities_calculate(portfolio=self.portfolio)
+        
+        self.assertEqual(holdings['EEUU'].quantity, Decimal('2500000'))
+        self.assertEqual(PortfolioHolding.objects.get().quantity, Decimal('2500000'))
+    
+    def test_service_skips_assets_without_price(self):
+        self._weight(self.eeuu, Decimal('0.5'))
+        self._weight(self.europa, Decimal('0.5'))
+        self._price(self.eeuu, Decimal('100'))
+        
+        with self.assertLogs('portfolios.services', level='WARNING') as logs:
+            holdings = portfolio_initial_quantities_calculate(portfolio=self.portfolio)
+        
+        self.assertEqual(set(holdings), {'EEUU'})
+        self.assertIn('Price not found for asset Europa', logs.output[0])
+    
+    def test_service_ignores_weights_of_other_portfolios(self):
+        other = Portfolio.objects.create(name='Portfolio 2')
+        self._weight(self.eeuu, Decimal('0.5'))
+        self._weight(self.europa, Decimal('0.5'), portfolio=other)
+        self._price(self.eeuu, Decimal('100'))
+        self._price(self.europa, Decimal('100'))
+        
+        holdings = portfolio_initial_quantities_calculate(portfolio=self.portfolio)
+        
+        self.assertEqual(set(holdings), {'EEUU'})
+        self.assertFalse(PortfolioHolding.objects.filter(portfolio=other).exists())
+    
+    def test_service_returns_nothing_without_weights(self):
+        with self.assertLogs('portfolios.services', level='WARNING'):
+            holdings = portfolio_initial_quantities_calculate(portfolio=self.portfolio)
+        
+        self.assertEqual(holdings, {})
+        self.assertEqual(PortfolioHolding.objects.count(), 0)
+    
+    def test_service_raises_error_for_missing_initial_value(self):
+        self.portfolio.initial_value = None
+        
+        with self.assertRaisesMessage(ValidationError, 'missing initial_value'):
+            portfolio_initial_quantities_calculate(portfolio=self.portfolio)
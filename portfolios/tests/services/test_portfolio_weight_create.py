@@ -0,0 +1,74 @@
+from decimal import Decimal
+
+from django.core.exceptions import ValidationError
+from django.test import TestCase
+
+from portfolios.models import Asset, Portfolio, PortfolioWeight
+from portfolios.services import portfolio_weight_create
+
+
+class PortfolioWeightCreateTests(TestCase):
+    def setUp(self):
+        self.portfolio = Portfolio.objects.create(name='Portfolio 1')
+        self.asset = Asset.objects.create(name='EEUU')
+    
+    def test_service_creates_weight(self):
+        # Lookup, SAVEPOINT, INSERT, RELEASE and the read-back
+        with self.assertNumQueries(5):
+            weight = portfolio_weight_create(
+                portfolio=self.portfolio,
+                asset=self.asset,
+                initial_weight=Decimal('0.15'),
+                validate=False
+            )
+        
+        self.assertIsNotNone(weight.pk)
+        self.assertEqual(weight, PortfolioWeight.objects.get())
+        self.assertEqual(weight.initial_weight, Decimal('0.15'))
+    
+    def test_service_skips_write_for_unchanged_weight(self):
+        existing = PortfolioWeight.objects.create(
+            portfolio=self.portfolio,
+            asset=self.asset,
+            initial_weight=Decimal('0.15')
+        )
+        
+        # Portfolio and asset checks, then the lookup
+        with self.assertNumQueries(3):
+            weight = portfolio_weight_create(
+                portfolio=self.portfolio,
+                asset=self.asset,
+                initial_weight=Decimal('0.15')
+            )
+        
+        self.assertEqual(weight.pk, existing.pk)
+        self.assertEqual(weight.updated_at, existing.updated_at)
+    
+    def test_service_updates_changed_weight(self):
+        existing = PortfolioWeight.objects.create(
+            portfolio=self.portfolio,
+            asset=self.asset,
+            initial_weight=Decimal('0.15')
+        )
+        
+        weight = portfolio_weight_create(
+            portfolio=self.portfolio,
+            asset=self.asset,
+            initial_weight=Decimal('0.25')
+        )
+        
+        self.assertEqual(weight.pk, existing.pk)
+        self.assertEqual(PortfolioWeight.objects.get().initial_weight, Decimal('0.25'))
+    
+    def test_service_raises_error_for_weight_out_of_range(self):
+        # weight_range_0_to_1 is enforced by the database only
+        for initial_weight in [Decimal('-0.1'), Decimal('1.5')]:
+            with self.subTest(initial_weight=initial_weight):
+                with self.assertRaisesMessage(ValidationError, 'could not be saved'):
+                    portfolio_weight_create(
+                        portfolio=self.portfolio,
+                        asset=self.asset,
+                        initial_weight=initial_weight
+                    )
+        
+        self.assertEqual(PortfolioWeight.objects.count(), 0)
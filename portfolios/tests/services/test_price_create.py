@@ -0,0 +1,74 @@
+from datetime import date
+from decimal import Decimal
+
+from django.core.exceptions import ValidationError
+from django.test import TestCase
+
+from portfolios.models import Asset, Price
+from portfolios.services import price_create
+
+
+class PriceCreateTests(TestCase):
+    def setUp(self):
+        self.asset = Asset.objects.create(name='EEUU')
+        self.date = date(2022, 2, 15)
+    
+    def test_service_creates_price(self):
+        # Asset check, lookup, SAVEPOINT, INSERT, RELEASE and the read-back
+        with self.assertNumQueries(6):
+            price = price_create(asset=self.asset, date=self.date, price=Decimal('123.45'))
+        
+        self.assertIsNotNone(price.pk)
+        self.assertEqual(price, Price.objects.get(asset=self.asset, date=self.date))
+        self.assertEqual(price.price, Decimal('123.45'))
+    
+    def test_service_skips_write_for_unchanged_price(self):
+        existing = Price.objects.create(asset=self.asset, date=self.date, price=Decimal('123.45'))
+        
+        with self.assertNumQueries(1):
+            price = price_create(
+                asset=self.asset,
+                date=self.date,
+                price=Decimal('123.45'),
+                validate=False
+            )
+        
+        self.assertEqual(price.pk, existing.pk)
+        self.assertEqual(price.updated_at, existing.updated_at)
+    
+    def test_service_updates_changed_price(self):
+        existing = Price.objects.create(asset=self.asset, date=self.date, price=Decimal('123.45'))
+        
+        # Lookup, SAVEPOINT, UPDATE and RELEASE
+        with self.assertNumQueries(4):
+            price = price_create(
+                asset=self.asset,
+                date=self.date,
+                price=Decimal('150.00'),
+                validate=False
+            )
+        
+        self.assertEqual(price.pk, existing.pk)
+        self.assertEqual(Price.objects.get().price, Decimal('150.00'))
+    
+    def test_service_raises_error_for_invalid_price(self):
+        with self.assertRaises(ValidationError):
+            price_create(asset=self.asset, date=self.date, price=Decimal('1.001'))
+        
+        self.assertEqual(Price.objects.count(), 0)
+    
+    def test_service_raises_error_for_constraint_violation(self):
+        existing = Price.objects.create(asset=self.asset, date=self.date, price=Decimal('123.45'))
+        
+        # price_positive is enforced by the database only
+        for price in [Decimal('0'), Decimal('-1')]:
+            with self.subTest(price=price):
+                with self.assertRaisesMessage(ValidationError, 'could not be saved'):
+                    price_create(asset=self.asset, date=date(2022, 2, 16), price=price)
+        
+        # Updating the stored row is rejected the same way
+        with self.assertRaisesMessage(ValidationError, 'could not be saved'):
+            price_create(asset=self.asset, date=self.date, price=Decimal('-1'))
+        
+        # The savepoint leaves the surrounding transaction usable
+        self.assertEqual(Price.objects.get().price, existing.price)